@@ -1,18 +1,67 @@
 import re
 import praw
 import time
-import json
+import orjson
+import asyncio
+import aiohttp
 import pymongo
+import shutil
 import logging
-from typing import List, Dict
-from pymongo import MongoClient
-from datetime import datetime, timezone
+import threading
+import tempfile
+import subprocess
+import ahocorasick
+from types import SimpleNamespace
+from dataclasses import dataclass
+from pybloom_live import ScalableBloomFilter
+from typing import List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
+from bson import json_util
 from prawcore.exceptions import PrawcoreException
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+REDDIT_TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+REDDIT_OAUTH_URL = "https://oauth.reddit.com"
+# Top-level comments only, best first. raw_json=1 stops Reddit HTML-escaping &, < and >
+COMMENT_PARAMS = {'sort': 'top', 'limit': 100, 'depth': 1, 'raw_json': 1}
+
+# URLs, Reddit markdown links and non-ASCII special characters, matched in one pass
+_CLEAN_RE = re.compile(
+    r'(?P<url>https?://\S+)'
+    r'|(?P<md>\[(?P<anchor>[^\]]*)\]\((?P<target>[^)]*)\))'
+    r'|(?P<bad>[^\w\s\x00-\x7f]+)'
+)
+
+# ASCII special characters are deleted with a lookup table, keeping basic punctuation
+_STRIP_ASCII = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if not (c.isalnum() or c.isspace() or c in '.,!?-_')
+))
+
+
+def _clean_sub(match: re.Match) -> str:
+    """Keep the text of links to URLs and drop everything else"""
+    if match.lastgroup == 'md' and match.group('target').startswith(('http://', 'https://')):
+        # Stripping the URL first used to leave the link text behind, so keep it
+        return _CLEAN_RE.sub(_clean_sub, match.group('anchor'))
+    return ''
+
+
+def _parse_comments(comment_listing: Dict) -> List[SimpleNamespace]:
+    """Wrap the comments of a raw /comments listing so they read like PRAW comments"""
+    # "more" stubs are skipped, matching replace_more(limit=0)
+    return [SimpleNamespace(**child['data']) for child in comment_listing['data']['children']
+            if child['kind'] == 't1']
+
+
+# "?" or question-like phrases, matched case-insensitively in a single scan
+_QUESTION_RE = re.compile(r'\?|how|what|why|can|should|help|advice', re.IGNORECASE)
+
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -22,11 +71,161 @@ logging.basicConfig(
     ]
 )
 
+
+@dataclass(slots=True)
+class QAPair:
+    """A scraped Q&A pair, converted to a MongoDB document only when saved"""
+    question_id: str
+    question_text: str
+    answer_text: str
+    subreddit: str
+    created_utc: int
+    url: str
+    source: str = "reddit"
+
+    def to_dict(self) -> Dict:
+        """Build the MongoDB document for this Q&A pair, leaving classification to classify_all"""
+        return {
+            "question_id": self.question_id,
+            "therapeutic_modality": None,
+            "question_text": self.question_text,
+            "answer_text": self.answer_text,
+            "metadata": {
+                "topic_or_issue": self.subreddit,
+                "complexity_level": None,
+                "modality_specific_tag": None
+            },
+            "more": {
+                "subreddit": self.subreddit,
+                "source": self.source,
+                "created_utc": self.created_utc,
+                "url": self.url
+            }
+        }
+
+
+class _RateLimiter:
+    """Cap concurrent Reddit OAuth requests and pace them from the X-Ratelimit-* headers"""
+
+    def __init__(self, max_concurrent: int):
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._lock = asyncio.Lock()
+        self._interval = 0.0
+        self._next_request_at = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            # Reserve the next free slot, so requests are spread evenly over the window
+            async with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_request_at)
+                self._next_request_at = start + self._interval
+            await asyncio.sleep(start - now)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    async def __aexit__(self, *exc_info):
+        self._semaphore.release()
+
+    def update(self, headers):
+        """Recompute the request interval from a response's rate-limit headers"""
+        remaining = headers.get('X-Ratelimit-Remaining')
+        reset = headers.get('X-Ratelimit-Reset')
+        if remaining is None or reset is None:
+            return
+        remaining, reset = float(remaining), float(reset)
+        self._interval = reset / max(remaining, 1)
+        if remaining < 1:
+            # Window exhausted, hold every request until it resets
+            self._next_request_at = max(self._next_request_at, time.monotonic() + reset)
+
+
+def _clean_text(text: str) -> str:
+    """Clean and format text content"""
+    if not text:
+        return ""
+    
+    # Remove URLs, Reddit formatting and special characters, then collapse whitespace so
+    # that words are always separated by exactly one space
+    return ' '.join(_CLEAN_RE.sub(_clean_sub, text).translate(_STRIP_ASCII).split())
+
+
+def _word_count(text: str) -> int:
+    """Count the words of text produced by _clean_text"""
+    return text.count(' ') + 1 if text else 0
+
+
+def _question_id(post, comment) -> str:
+    """Build the unique id of the Q&A pair formed by a post and comment"""
+    return f"{post.id}_{comment.id}"
+
+
+def _extract_qa_pair(post, comment) -> QAPair:
+    """Extract and format a Q&A pair from a post and comment"""
+    # Combine title and selftext for the question
+    question_text = f"{post.title}\n\n{post.selftext}" if post.selftext else post.title
+    question_text = _clean_text(question_text)
+    
+    answer_text = _clean_text(comment.body)
+    
+    return QAPair(
+        question_id=_question_id(post, comment),
+        question_text=question_text,
+        answer_text=answer_text,
+        subreddit=str(post.subreddit),
+        created_utc=int(post.created_utc),
+        url=f"https://reddit.com{post.permalink}"
+    )
+
+
 class TherapyDataScraper:
+    CATEGORY_KEYWORDS = {
+        "anxiety": ["anxiety", "panic", "stress", "worry", "anxious"],
+        "depression": ["depression", "depressed", "mood", "sad", "hopeless"],
+        "trauma": ["trauma", "ptsd", "abuse", "traumatic"],
+        "relationships": ["relationship", "marriage", "partner", "family", "couple"],
+        "therapy_types": ["cbt", "dbt", "emdr", "psychodynamic", "behavioral"],
+    }
+    # Checked in order, the first modality found wins
+    MODALITY_KEYWORDS = {
+        "CBT": ["cbt"],
+        "DBT": ["dbt"],
+        # Add more modality detection keywords here
+    }
+    MODALITY_TAG_KEYWORDS = {
+        "Parts Work": ["parts"],
+        # Add more modality-specific tag keywords here
+    }
+
+    # created_utc is stored as a Unix timestamp and formatted server-side on export
+    EXPORT_VIEW = "qa_pairs_export"
+    EXPORT_PIPELINE = [
+        {'$unset': '_id'},
+        {'$set': {'more.created_utc': {'$cond': [
+            {'$isNumber': '$more.created_utc'},
+            {'$dateToString': {
+                'date': {'$toDate': {'$multiply': ['$more.created_utc', 1000]}},
+                'format': '%Y-%m-%dT%H:%M:%S+00:00'
+            }},
+            '$more.created_utc'
+        ]}}}
+    ]
+
     def __init__(self):
         try:
             # Use the MONGO_URI from environment variables
-            self.client = MongoClient(os.getenv("MONGO_URI"), serverSelectionTimeoutMS=5000)
+            # Bulk writes are acknowledged without waiting on the journal, and payloads
+            # are zstd-compressed on the wire when the server supports it
+            self.client = MongoClient(
+                os.getenv("MONGO_URI"),
+                serverSelectionTimeoutMS=5000,
+                w=1,
+                journal=False,
+                maxPoolSize=50,
+                compressors='zstd'
+            )
             self.db = self.client['therapy_data']
             self.qa_collection = self.db['qa_pairs']
             self.client.server_info()
@@ -35,12 +234,19 @@ class TherapyDataScraper:
             logging.error(f"MongoDB connection error: {e}")
             raise
 
+        # Reddit throttles generic user agents, so fall back to its recommended format
+        self.user_agent = os.getenv('REDDIT_USER_AGENT') or \
+            f"python:volo_health:v1.0 (by /u/{os.getenv('REDDIT_USERNAME', 'unknown')})"
+
         try:
-            # Use the Reddit API credentials from environment variables
+            # Use the Reddit API credentials from environment variables. With a username and
+            # password PRAW authenticates as a script app, which has a higher rate limit
             self.reddit = praw.Reddit(
                 client_id=os.getenv('REDDIT_CLIENT_ID'),
                 client_secret=os.getenv('REDDIT_CLIENT_SECRET'),
-                user_agent=os.getenv('REDDIT_USER_AGENT')
+                username=os.getenv('REDDIT_USERNAME'),
+                password=os.getenv('REDDIT_PASSWORD'),
+                user_agent=self.user_agent
             )
             logging.info("Successfully connected to Reddit API")
         except Exception as e:
@@ -51,8 +257,66 @@ class TherapyDataScraper:
             "therapy", "mentalhealth", "TalkTherapy", "psychotherapy",
             "CBT", "DBT", "askatherapist", "therapeuticquestions"
         ]
+        self.insert_batch_size = 200
+        self.max_workers = 4
+        self.max_comment_workers = 8
+        # Comment fetches in flight across all subreddit threads. With the max_workers listing
+        # threads this stays within the 10 connections of requests' default pool
+        self._comment_requests = threading.BoundedSemaphore(6)
+        self.max_concurrent_requests = 8
+        self.max_retries = 3
+        self._kw = self._build_keyword_automaton()
         
         self._setup_indexes()
+        self._load_seen_ids()
+
+    def _load_seen_ids(self):
+        """Load the stored question_ids into a Bloom filter so duplicates are skipped without a DB call"""
+        self._seen_lock = threading.Lock()
+        try:
+            # The filter grows past its initial capacity instead of raising once full
+            self._seen = ScalableBloomFilter(
+                initial_capacity=max(100_000, 2 * self.qa_collection.estimated_document_count()),
+                error_rate=0.001,
+                mode=ScalableBloomFilter.LARGE_SET_GROWTH
+            )
+            for doc in self.qa_collection.find({}, {'question_id': 1, '_id': 0}).batch_size(10000):
+                self._seen.add(doc['question_id'])
+            logging.info(f"Loaded {len(self._seen)} existing question IDs")
+        except Exception as e:
+            logging.error(f"Error loading existing question IDs, relying on upserts for dedup: {e}")
+            self._seen = None
+
+    def _mark_seen(self, question_id: str) -> bool:
+        """Record a question_id, returning False if it has (probably) been seen before"""
+        with self._seen_lock:
+            if self._seen is None:
+                return True
+            try:
+                if question_id in self._seen:
+                    return False
+                self._seen.add(question_id)
+            except Exception as e:
+                # Treat everything as unseen, the upsert in _flush_pending still skips duplicates
+                logging.error(f"Disabling the seen-ID filter: {e}")
+                self._seen = None
+            return True
+
+    def _build_keyword_automaton(self) -> ahocorasick.Automaton:
+        """Build one automaton mapping every keyword to its (bucket, value) targets"""
+        targets = {}
+        for bucket, keyword_map in (("category", self.CATEGORY_KEYWORDS),
+                                    ("modality", self.MODALITY_KEYWORDS),
+                                    ("tag", self.MODALITY_TAG_KEYWORDS)):
+            for value, keywords in keyword_map.items():
+                for keyword in keywords:
+                    targets.setdefault(keyword, []).append((bucket, value))
+        
+        automaton = ahocorasick.Automaton()
+        for keyword, keyword_targets in targets.items():
+            automaton.add_word(keyword, keyword_targets)
+        automaton.make_automaton()
+        return automaton
 
     def _setup_indexes(self):
         """Set up MongoDB indexes"""
@@ -65,18 +329,7 @@ class TherapyDataScraper:
 
     def clean_text(self, text: str) -> str:
         """Clean and format text content"""
-        if not text:
-            return ""
-        
-        # Remove URLs
-        text = re.sub(r'http[s]?://\S+', '', text)
-        # Remove Reddit formatting
-        text = re.sub(r'\[.*?\]\(.*?\)', '', text)
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,!?-]', '', text)
-        return text.strip()
+        return _clean_text(text)
 
     def is_valid_qa(self, title: str, selftext: str, comment_body: str) -> bool:
         """Validate if the post and comment form a valid Q&A pair"""
@@ -91,93 +344,119 @@ class TherapyDataScraper:
             return False
             
         # Check if it looks like a question (has ? or question-like phrases)
-        question_indicators = ["?", "how", "what", "why", "can", "should", "help", "advice"]
-        has_question = any(indicator in title.lower() for indicator in question_indicators)
-        
-        return has_question
+        return _QUESTION_RE.search(title) is not None
 
-    def categorize_content(self, text: str) -> List[str]:
-        """Categorize the content based on keywords"""
-        categories = []
-        
-        category_keywords = {
-            "anxiety": ["anxiety", "panic", "stress", "worry", "anxious"],
-            "depression": ["depression", "depressed", "mood", "sad", "hopeless"],
-            "trauma": ["trauma", "ptsd", "abuse", "traumatic"],
-            "relationships": ["relationship", "marriage", "partner", "family", "couple"],
-            "therapy_types": ["cbt", "dbt", "emdr", "psychodynamic", "behavioral"],
-        }
+    def _analyze(self, text: str) -> Tuple[List[str], str, str]:
+        """Find the categories, therapeutic modality and modality-specific tag in one pass"""
+        found = {"category": set(), "modality": set(), "tag": set()}
+        for _, keyword_targets in self._kw.iter(text.lower()):
+            for bucket, value in keyword_targets:
+                found[bucket].add(value)
         
-        text_lower = text.lower()
-        for category, keywords in category_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
-                categories.append(category)
-                
-        return categories
+        categories = [category for category in self.CATEGORY_KEYWORDS if category in found["category"]]
+        modality = next((m for m in self.MODALITY_KEYWORDS if m in found["modality"]), "Unknown")
+        tag = next((t for t in self.MODALITY_TAG_KEYWORDS if t in found["tag"]), "None")
+        return categories, modality, tag
 
-    def extract_qa_pair(self, post, comment) -> Dict:
+    def extract_qa_pair(self, post, comment) -> QAPair:
         """Extract and format a Q&A pair from a post and comment"""
-        # Combine title and selftext for the question
-        question_text = f"{post.title}\n\n{post.selftext}" if post.selftext else post.title
-        question_text = self.clean_text(question_text)
-        
-        answer_text = self.clean_text(comment.body)
-        
-        categories = self.categorize_content(question_text + " " + answer_text)
+        return _extract_qa_pair(post, comment)
+
+    def classify(self, question_text: str, answer_text: str) -> Dict:
+        """Build the classification fields of a stored Q&A pair"""
+        categories, modality, modality_tag = self._analyze(question_text + " " + answer_text)
+        complexity = self.assess_complexity(_word_count(question_text), _word_count(answer_text))
         
         return {
-            "question_id": f"{post.id}_{comment.id}",
-            "therapeutic_modality": self.get_therapeutic_modality(question_text, answer_text),
-            "question_text": question_text,
-            "answer_text": answer_text,
-            "metadata": {
-                "topic_or_issue":  str(post.subreddit),
-                "complexity_level": self.assess_complexity(question_text, answer_text),
-                "modality_specific_tag": self.get_modality_specific_tag(question_text, answer_text)
-            },
-            "more": {
-                # "post_id": str(post.id),
-                # "comment_id": str(comment.id),
-                "subreddit": str(post.subreddit),
-                # "categories": categories,
-                # "question_score": post.score,
-                # "answer_score": comment.score,
-                "source": "reddit",
-                "created_utc": datetime.fromtimestamp(post.created_utc, tz=timezone.utc).isoformat(),
-                "url": f"https://reddit.com{post.permalink}"
-            }
+            "therapeutic_modality": modality,
+            "metadata.complexity_level": complexity,
+            "metadata.modality_specific_tag": modality_tag
         }
 
-    def get_therapeutic_modality(self, question_text: str, answer_text: str) -> str:
-        """Determine the therapeutic modality based on the content"""
-        if "cbt" in question_text.lower() or "cbt" in answer_text.lower():
-            return "CBT"
-        elif "dbt" in question_text.lower() or "dbt" in answer_text.lower():
-            return "DBT"
-        # Add more modality detection logic here
-        else:
-            return "Unknown"
+    def classify_all(self, reclassify: bool = False):
+        """Classify stored Q&A pairs in batches after scraping"""
+        query = {} if reclassify else {'therapeutic_modality': None}
+        cursor = self.qa_collection.find(query, {'question_text': 1, 'answer_text': 1}).batch_size(500)
+        
+        classified = 0
+        operations = []
+        try:
+            for doc in cursor:
+                fields = self.classify(doc['question_text'], doc['answer_text'])
+                operations.append(UpdateOne({'_id': doc['_id']}, {'$set': fields}))
+                if len(operations) >= 500:
+                    self.qa_collection.bulk_write(operations, ordered=False)
+                    classified += len(operations)
+                    operations = []
+            if operations:
+                self.qa_collection.bulk_write(operations, ordered=False)
+                classified += len(operations)
+            logging.info(f"Classified {classified} Q&A pairs")
+        except Exception as e:
+            logging.error(f"Error classifying Q&A pairs: {e}")
 
-    def assess_complexity(self, question_text: str, answer_text: str) -> str:
-        """Assess the complexity level of the question and answer"""
-        if len(question_text.split()) < 30 and len(answer_text.split()) < 100:
+    def assess_complexity(self, question_word_count: int, answer_word_count: int) -> str:
+        """Assess the complexity level of the question and answer from their word counts"""
+        if question_word_count < 30 and answer_word_count < 100:
             return "Low"
-        elif len(question_text.split()) < 50 and len(answer_text.split()) < 200:
+        elif question_word_count < 50 and answer_word_count < 200:
             return "Medium"
         else:
             return "High"
 
-    def get_modality_specific_tag(self, question_text: str, answer_text: str) -> str:
-        """Determine any modality-specific tags based on the content"""
-        if "parts" in question_text.lower() or "parts" in answer_text.lower():
-            return "Parts Work"
-        # Add more modality-specific tag logic here
-        else:
-            return "None"
+    def _flush_pending(self, pending: List[QAPair]):
+        """Bulk upsert pending Q&A pairs, inserting only question_ids not already stored"""
+        if not pending:
+            return
+        operations = [
+            UpdateOne({'question_id': qa_pair.question_id}, {'$setOnInsert': qa_pair.to_dict()}, upsert=True)
+            for qa_pair in pending
+        ]
+        try:
+            result = self.qa_collection.bulk_write(operations, ordered=False)
+            logging.info(f"Saved {result.upserted_count} new Q&A pairs, "
+                         f"skipped {len(operations) - result.upserted_count} existing ones")
+        except BulkWriteError as e:
+            # Concurrent upserts of the same question_id can still race on the unique index
+            write_errors = e.details.get('writeErrors', [])
+            duplicates = sum(1 for err in write_errors if err.get('code') == 11000)
+            if duplicates:
+                logging.info(f"Skipped {duplicates} duplicate Q&A pairs")
+            for err in write_errors:
+                if err.get('code') != 11000:
+                    logging.error(f"Error saving to MongoDB: {err.get('errmsg')}")
+        except Exception as e:
+            logging.error(f"Error saving to MongoDB: {e}")
+        pending.clear()
+
+    def is_candidate_post(self, post) -> bool:
+        """Check whether a post is worth fetching its comment tree for"""
+        return (not post.stickied and
+                post.num_comments >= 5 and  # Minimum comment count threshold
+                post.score >= 10)  # Minimum score threshold
+
+    def is_candidate_answer(self, post, comment) -> bool:
+        """Check whether a comment is a good enough answer to the post"""
+        return (hasattr(comment, 'body') and
+                comment.score > 3 and  # Minimum score threshold
+                len(comment.body) >= 50 and  # Minimum length threshold
+                self.is_valid_qa(post.title, post.selftext, comment.body))
 
-    def scrape_subreddit(self, subreddit_name: str, post_limit: int = 1000) -> List[Dict]:
+    def _fetch_post_comments(self, post) -> List[SimpleNamespace]:
+        """Fetch the top-level comments of a post, sorted by score"""
+        # PRAW is not documented as thread-safe. We assume concurrent read-only GETs on the
+        # shared session are acceptable: prawcore's rate limiter and token refresh are not
+        # synchronized, so under contention its pacing is only approximate and a token may
+        # be refreshed twice. Capping the total in flight keeps that contention small
+        with self._comment_requests:
+            _, comment_listing = self.reddit.request(method='GET', path=f"comments/{post.id}/",
+                                                     params=COMMENT_PARAMS)
+        return _parse_comments(comment_listing)
+
+    def scrape_subreddit(self, subreddit_name: str, post_limit: int = 1000) -> List[QAPair]:
         """Scrape Q&A pairs from a specific subreddit"""
         qa_pairs = []
+        pending = []
         logging.info(f"Scraping from r/{subreddit_name}")
         
         try:
@@ -192,40 +471,37 @@ class TherapyDataScraper:
                 else:
                     posts = subreddit.new(limit=post_limit//3)
 
-                for post in posts:
-                    if not post.stickied and post.num_comments > 0:
-                        # Sort comments by score to get quality answers
-                        post.comment_sort = 'top'
-                        post.comments.replace_more(limit=0)
-                        
-                        for comment in post.comments:
-                            if (hasattr(comment, 'body') and 
-                                comment.score > 3 and  # Minimum score threshold
-                                len(comment.body) >= 50 and  # Minimum length threshold
-                                self.is_valid_qa(post.title, post.selftext, comment.body)):
-                                
-                                qa_pair = self.extract_qa_pair(post, comment)
-                                qa_pairs.append(qa_pair)
-                                
-                                # Save to MongoDB
-                                try:
-                                    if self.qa_collection.count_documents({'question_id': qa_pair['question_id']}) == 0:
-                                        self.qa_collection.insert_one(qa_pair)
-                                    else:
-                                        logging.info(f"Skipping duplicate question with ID: {qa_pair['question_id']}")
-                                except Exception as e:
-                                    logging.error(f"Error saving to MongoDB: {e}")
-                                
-                                if len(qa_pairs) % 100 == 0:
-                                    logging.info(f"Collected {len(qa_pairs)} Q&A pairs from r/{subreddit_name}")
-                                    
-                    # Respect Reddit's rate limits
-                    time.sleep(2)
+                posts = [post for post in posts if self.is_candidate_post(post)]
+                
+                # Fetch comment trees concurrently over PRAW's shared session, see _fetch_post_comments
+                with ThreadPoolExecutor(max_workers=self.max_comment_workers) as executor:
+                    comment_trees = executor.map(self._fetch_post_comments, posts)
+                    candidates = [
+                        (post, comment)
+                        for post, comments in zip(posts, comment_trees)
+                        for comment in comments
+                        if self.is_candidate_answer(post, comment) and
+                        self._mark_seen(_question_id(post, comment))
+                    ]
+                
+                for post, comment in candidates:
+                    qa_pair = self.extract_qa_pair(post, comment)
+                    qa_pairs.append(qa_pair)
+                    
+                    # Save to MongoDB in batches
+                    pending.append(qa_pair)
+                    if len(pending) >= self.insert_batch_size:
+                        self._flush_pending(pending)
+                    
+                    if len(qa_pairs) % 100 == 0:
+                        logging.info(f"Collected {len(qa_pairs)} Q&A pairs from r/{subreddit_name}")
                     
         except PrawcoreException as e:
             logging.error(f"Reddit API error while scraping r/{subreddit_name}: {e}")
         except Exception as e:
             logging.error(f"Unexpected error while scraping r/{subreddit_name}: {e}")
+        finally:
+            self._flush_pending(pending)
             
         return qa_pairs
 
@@ -234,26 +510,238 @@ class TherapyDataScraper:
         total_pairs = 0
         pairs_per_subreddit = target_count // len(self.subreddits)
         
-        for subreddit in self.subreddits:
-            qa_pairs = self.scrape_subreddit(subreddit, pairs_per_subreddit)
-            total_pairs += len(qa_pairs)
+        # Subreddits share one praw.Reddit instance, see _fetch_post_comments for the thread-safety caveat
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.scrape_subreddit, subreddit, pairs_per_subreddit): subreddit
+                for subreddit in self.subreddits
+            }
+            
+            for future in as_completed(futures):
+                subreddit = futures[future]
+                total_pairs += len(future.result())
+                
+                logging.info(f"Completed scraping r/{subreddit}. Total pairs so far: {total_pairs}")
+                
+                if total_pairs >= target_count:
+                    for pending_future in futures:
+                        pending_future.cancel()
+                    break
+
+        logging.info(f"Scraping completed. Total Q&A pairs collected: {total_pairs}")
+
+    async def _fetch_access_token(self) -> str:
+        """Obtain an OAuth bearer token from Reddit, as a script app when credentials are set"""
+        auth = aiohttp.BasicAuth(os.getenv('REDDIT_CLIENT_ID'), os.getenv('REDDIT_CLIENT_SECRET'))
+        if os.getenv('REDDIT_USERNAME') and os.getenv('REDDIT_PASSWORD'):
+            data = {
+                'grant_type': 'password',
+                'username': os.getenv('REDDIT_USERNAME'),
+                'password': os.getenv('REDDIT_PASSWORD')
+            }
+        else:
+            data = {'grant_type': 'client_credentials'}
+        
+        headers = {'User-Agent': self.user_agent}
+        async with aiohttp.ClientSession(headers=headers) as session:
+            async with session.post(REDDIT_TOKEN_URL, auth=auth, data=data) as response:
+                response.raise_for_status()
+                return (await response.json())['access_token']
+
+    async def _get_json(self, session: aiohttp.ClientSession, limiter: _RateLimiter,
+                        path: str, params: Dict):
+        """GET a JSON document from the Reddit OAuth API, retrying 429 and 5xx responses"""
+        for attempt in range(self.max_retries + 1):
+            async with limiter:
+                async with session.get(f"{REDDIT_OAUTH_URL}{path}", params=params) as response:
+                    limiter.update(response.headers)
+                    retryable = response.status == 429 or response.status >= 500
+                    if not retryable or attempt == self.max_retries:
+                        response.raise_for_status()
+                        return await response.json()
+                    
+                    retry_after = response.headers.get('Retry-After', '')
+                    delay = int(retry_after) if retry_after.isdigit() else 2 ** attempt
             
-            logging.info(f"Completed scraping r/{subreddit}. Total pairs so far: {total_pairs}")
+            logging.warning(f"Reddit returned {response.status} for {path}, retrying in {delay}s")
+            await asyncio.sleep(delay)
+
+    async def _fetch_posts(self, session: aiohttp.ClientSession, limiter: _RateLimiter,
+                           subreddit_name: str, category: str, limit: int) -> List[SimpleNamespace]:
+        """Page through a subreddit listing, 100 posts per request"""
+        posts = []
+        params = {'raw_json': 1}
+        if category == 'top':
+            params['t'] = 'year'
+        
+        while len(posts) < limit:
+            params['limit'] = min(100, limit - len(posts))
+            listing = await self._get_json(session, limiter, f"/r/{subreddit_name}/{category}.json", params)
+            children = listing['data']['children']
+            posts.extend(SimpleNamespace(**child['data']) for child in children)
             
-            if total_pairs >= target_count:
+            params['after'] = listing['data']['after']
+            if not children or not params['after']:
                 break
                 
-            # Add delay between subreddits
-            time.sleep(5)
+        return posts
 
+    async def _fetch_comments(self, session: aiohttp.ClientSession, limiter: _RateLimiter,
+                              post: SimpleNamespace) -> List[SimpleNamespace]:
+        """Fetch the top-level comments of a post, sorted by score"""
+        _, comment_listing = await self._get_json(session, limiter, f"/comments/{post.id}.json",
+                                                  COMMENT_PARAMS)
+        return _parse_comments(comment_listing)
+
+    async def scrape_subreddit_async(self, session: aiohttp.ClientSession, limiter: _RateLimiter,
+                                     subreddit_name: str, post_limit: int = 1000) -> List[QAPair]:
+        """Scrape Q&A pairs from a specific subreddit, fetching comment trees concurrently"""
+        qa_pairs = []
+        pending = []
+        logging.info(f"Scraping from r/{subreddit_name}")
+        
+        try:
+            for category in ['hot', 'top', 'new']:
+                try:
+                    posts = await self._fetch_posts(session, limiter, subreddit_name, category, post_limit//3)
+                except aiohttp.ClientError as e:
+                    logging.error(f"Reddit API error while listing r/{subreddit_name}/{category}: {e}")
+                    continue
+                
+                posts = [post for post in posts if self.is_candidate_post(post)]
+                results = await asyncio.gather(
+                    *(self._fetch_comments(session, limiter, post) for post in posts),
+                    return_exceptions=True
+                )
+                
+                # A post whose comments could not be fetched is skipped, not the whole subreddit
+                comment_trees = []
+                for post, result in zip(posts, results):
+                    if isinstance(result, Exception):
+                        logging.warning(f"Skipping post {post.id} in r/{subreddit_name}: {result}")
+                        result = []
+                    comment_trees.append(result)
+                
+                candidates = [
+                    (post, comment)
+                    for post, comments in zip(posts, comment_trees)
+                    for comment in comments
+                    if self.is_candidate_answer(post, comment) and
+                    self._mark_seen(_question_id(post, comment))
+                ]
+                
+                for post, comment in candidates:
+                    qa_pair = self.extract_qa_pair(post, comment)
+                    qa_pairs.append(qa_pair)
+                    
+                    pending.append(qa_pair)
+                    if len(pending) >= self.insert_batch_size:
+                        batch, pending = pending, []
+                        await asyncio.to_thread(self._flush_pending, batch)
+                    
+                    if len(qa_pairs) % 100 == 0:
+                        logging.info(f"Collected {len(qa_pairs)} Q&A pairs from r/{subreddit_name}")
+                                
+        except Exception as e:
+            logging.error(f"Unexpected error while scraping r/{subreddit_name}: {e}")
+        finally:
+            await asyncio.to_thread(self._flush_pending, pending)
+            
+        return qa_pairs
+
+    async def scrape_all_subreddits_async(self, target_count: int = 5000):
+        """Scrape data from all configured subreddits concurrently over the Reddit OAuth API
+
+        Once target_count is reached, the subreddits still being scraped are cancelled
+        and save the pairs they have collected so far.
+        """
+        total_pairs = 0
+        pairs_per_subreddit = target_count // len(self.subreddits)
+        
+        token = await self._fetch_access_token()
+        headers = {
+            'Authorization': f"bearer {token}",
+            'User-Agent': self.user_agent
+        }
+        limiter = _RateLimiter(self.max_concurrent_requests)
+        
+        async with aiohttp.ClientSession(headers=headers) as session:
+            tasks = {
+                asyncio.create_task(
+                    self.scrape_subreddit_async(session, limiter, subreddit, pairs_per_subreddit),
+                    name=subreddit
+                )
+                for subreddit in self.subreddits
+            }
+                
+            try:
+                running = tasks
+                while running and total_pairs < target_count:
+                    done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        total_pairs += len(task.result())
+                        logging.info(f"Completed scraping r/{task.get_name()}. "
+                                     f"Total pairs so far: {total_pairs}")
+            finally:
+                for task in tasks:
+                    task.cancel()
+                # Wait for cancelled scrapes to flush their pending pairs
+                await asyncio.gather(*tasks, return_exceptions=True)
+            
         logging.info(f"Scraping completed. Total Q&A pairs collected: {total_pairs}")
 
     def export_to_json(self, filename: str = "therapy_qa_data.json"):
-        """Export the collection to a JSON file"""
+        """Export the collection to a JSON file, using mongoexport when it is installed"""
+        if shutil.which('mongoexport') and os.getenv("MONGO_URI"):
+            if self._export_with_mongoexport(filename):
+                return
+            logging.info("Falling back to exporting through the Python driver")
+        self._export_with_cursor(filename)
+
+    def _export_with_mongoexport(self, filename: str) -> bool:
+        """Have mongoexport write the JSON array directly, bypassing the Python driver"""
         try:
-            data = list(self.qa_collection.find({}, {'_id': 0}))
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, default=str, indent=2)
+            # mongoexport cannot run a pipeline, so it exports a temporary view that applies
+            # one. The view is dropped again once the export finishes
+            self.db.drop_collection(self.EXPORT_VIEW)
+            self.db.create_collection(self.EXPORT_VIEW, viewOn=self.qa_collection.name,
+                                      pipeline=self.EXPORT_PIPELINE)
+            # The URI goes in a private config file so its credentials don't show up in ps.
+            # A JSON string is also a valid quoted YAML scalar
+            with tempfile.NamedTemporaryFile('w', suffix='.yaml') as config:
+                config.write(f"uri: {orjson.dumps(os.getenv('MONGO_URI')).decode()}\n")
+                config.flush()
+                subprocess.run([
+                    'mongoexport',
+                    '--config', config.name,
+                    '--db', self.db.name,
+                    '--collection', self.EXPORT_VIEW,
+                    '--jsonArray',
+                    '--out', filename
+                ], check=True, capture_output=True, text=True)
+            logging.info(f"Successfully exported data to {filename}")
+            return True
+        except subprocess.CalledProcessError as e:
+            logging.error(f"Error exporting data with mongoexport: {e.stderr.strip()}")
+        except Exception as e:
+            logging.error(f"Error exporting data with mongoexport: {e}")
+        finally:
+            try:
+                self.db.drop_collection(self.EXPORT_VIEW)
+            except Exception as e:
+                logging.error(f"Error dropping the {self.EXPORT_VIEW} view: {e}")
+        return False
+
+    def _export_with_cursor(self, filename: str):
+        """Export the collection to a JSON file, streaming one document at a time"""
+        try:
+            cursor = self.qa_collection.aggregate(self.EXPORT_PIPELINE, batchSize=500)
+            with open(filename, 'wb') as f:
+                f.write(b'[')
+                for i, doc in enumerate(cursor):
+                    f.write(b',\n' if i else b'\n')
+                    f.write(orjson.dumps(doc, default=json_util.default))
+                f.write(b'\n]')
             logging.info(f"Successfully exported data to {filename}")
         except Exception as e:
             logging.error(f"Error exporting data: {e}")
@@ -264,7 +752,10 @@ def main():
         scraper = TherapyDataScraper()
         
         # Scrape data from all subreddits
-        scraper.scrape_all_subreddits(5000)
+        asyncio.run(scraper.scrape_all_subreddits_async(5000))
+        
+        # Classify the newly scraped Q&A pairs
+        scraper.classify_all()
         
         # Export the data
         scraper.export_to_json()